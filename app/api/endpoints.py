@@ -1,89 +1,127 @@
 """API endpoints for weather service."""
 
-from typing import Optional, Dict, Any
-import json
-from datetime import datetime
-from fastapi import APIRouter, Query, Depends, HTTPException, status
+from typing import Annotated, Optional, Dict, Any, List
+from datetime import datetime, timezone
+import asyncio
+import hashlib
+from fastapi import APIRouter, Query, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func, tuple_
+from sqlalchemy.orm import defer
 from app.models import get_db, SearchHistory
-from app.services import WeatherService
+from app.services import (
+    WeatherService,
+    OWMRawWeather,
+    OWMRawForecast,
+    get_weather_service,
+    get_history_queue,
+    encode_response_data,
+)
 from app.api.schemas import (
+    WeatherQuery,
     WeatherResponse,
     ForecastResponse,
     ForecastItem,
     SearchHistoryResponse,
-    SearchHistoryItem,
     ErrorResponse,
     DeleteHistoryResponse,
 )
 
 router = APIRouter(prefix="/weather", tags=["weather"])
 
+_FORECAST_ADAPTER = TypeAdapter(List[ForecastItem])
+
 
-def parse_weather_data(data: Dict[str, Any]) -> WeatherResponse:
+def parse_weather_data(data: OWMRawWeather) -> WeatherResponse:
     """Parse OpenWeatherMap data to WeatherResponse schema."""
     return WeatherResponse(
-        city=data.get("name"),
-        country=data.get("sys", {}).get("country"),
-        latitude=data["coord"]["lat"],
-        longitude=data["coord"]["lon"],
-        temperature=data["main"]["temp"],
-        feels_like=data["main"]["feels_like"],
-        temp_min=data["main"]["temp_min"],
-        temp_max=data["main"]["temp_max"],
-        pressure=data["main"]["pressure"],
-        humidity=data["main"]["humidity"],
-        visibility=data.get("visibility"),
-        wind_speed=data["wind"]["speed"],
-        wind_deg=data["wind"]["deg"],
-        clouds=data["clouds"]["all"],
-        weather=data["weather"][0]["main"],
-        weather_description=data["weather"][0]["description"],
-        weather_icon=data["weather"][0]["icon"],
-        timestamp=datetime.fromtimestamp(data["dt"]),
+        city=data.name,
+        country=data.sys.country,
+        latitude=data.coord.lat,
+        longitude=data.coord.lon,
+        temperature=data.main.temp,
+        feels_like=data.main.feels_like,
+        temp_min=data.main.temp_min,
+        temp_max=data.main.temp_max,
+        pressure=data.main.pressure,
+        humidity=data.main.humidity,
+        visibility=data.visibility,
+        wind_speed=data.wind.speed,
+        wind_deg=data.wind.deg,
+        clouds=data.clouds.all,
+        weather=data.weather[0].main,
+        weather_description=data.weather[0].description,
+        weather_icon=data.weather[0].icon,
+        timestamp=datetime.fromtimestamp(data.dt),
     )
 
 
-def parse_forecast_data(data: Dict[str, Any], days: int) -> ForecastResponse:
+def parse_forecast_data(data: OWMRawForecast, days: int) -> ForecastResponse:
     """Parse OpenWeatherMap forecast data to ForecastResponse schema."""
-    forecast_items = []
-
-    for item in data["list"]:
-        forecast_items.append(
-            ForecastItem(
-                datetime=datetime.fromtimestamp(item["dt"]),
-                temperature=item["main"]["temp"],
-                feels_like=item["main"]["feels_like"],
-                temp_min=item["main"]["temp_min"],
-                temp_max=item["main"]["temp_max"],
-                pressure=item["main"]["pressure"],
-                humidity=item["main"]["humidity"],
-                weather=item["weather"][0]["main"],
-                weather_description=item["weather"][0]["description"],
-                weather_icon=item["weather"][0]["icon"],
-                wind_speed=item["wind"]["speed"],
-                wind_deg=item["wind"]["deg"],
-                clouds=item["clouds"]["all"],
-                pop=item.get("pop", 0),
-            )
-        )
+    # Validate every item in one pydantic-core call instead of one model at a time
+    forecast_items = _FORECAST_ADAPTER.validate_python(
+        [
+            {
+                "datetime": datetime.fromtimestamp(item.dt),
+                "temperature": item.main.temp,
+                "feels_like": item.main.feels_like,
+                "temp_min": item.main.temp_min,
+                "temp_max": item.main.temp_max,
+                "pressure": item.main.pressure,
+                "humidity": item.main.humidity,
+                "weather": item.weather[0].main,
+                "weather_description": item.weather[0].description,
+                "weather_icon": item.weather[0].icon,
+                "wind_speed": item.wind.speed,
+                "wind_deg": item.wind.deg,
+                "clouds": item.clouds.all,
+                "pop": item.pop,
+            }
+            for item in data.list
+        ]
+    )
 
     return ForecastResponse(
-        city=data["city"]["name"],
-        country=data["city"]["country"],
-        latitude=data["city"]["coord"]["lat"],
-        longitude=data["city"]["coord"]["lon"],
+        city=data.city.name,
+        country=data.city.country,
+        latitude=data.city.coord.lat,
+        longitude=data.city.coord.lon,
         days_requested=days,
         forecast=forecast_items,
     )
 
 
+def cacheable_json_response(request: Request, payload: BaseModel) -> Response:
+    """
+    Serialize a weather response with Cache-Control and ETag headers.
+
+    Clients must revalidate every time (no-cache) so each search still reaches
+    us and is recorded in history, but an unchanged body comes back as a 304.
+    The body is rendered once by pydantic-core and reused for the ETag,
+    skipping FastAPI's response_model validation and jsonable_encoder.
+
+    Returns:
+        A 304 response if the client's If-None-Match matches, else the JSON body
+    """
+    body = payload.model_dump_json().encode()
+    digest = hashlib.blake2b(body, digest_size=8)
+    headers = {
+        "Cache-Control": "no-cache",
+        "ETag": f'"{digest.hexdigest()}"',
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if headers["ETag"] in client_etags or "*" in client_etags:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get(
     "",
     response_model=WeatherResponse,
     responses={
-        400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
@@ -91,51 +129,45 @@ def parse_forecast_data(data: Dict[str, Any], days: int) -> ForecastResponse:
     description="Get current weather by city name or coordinates",
 )
 async def get_weather(
-    city: Optional[str] = Query(None, description="City name"),
-    lat: Optional[float] = Query(None, description="Latitude", ge=-90, le=90),
-    lon: Optional[float] = Query(None, description="Longitude", ge=-180, le=180),
-    db: AsyncSession = Depends(get_db),
-) -> WeatherResponse:
+    request: Request,
+    query: Annotated[WeatherQuery, Query()],
+    weather_service: WeatherService = Depends(get_weather_service),
+    history_queue: asyncio.Queue[Dict[str, Any]] = Depends(get_history_queue),
+) -> Response:
     """
     Get current weather data.
 
-    Either city or both lat and lon must be provided.
+    Either city or both lat and lon must be provided; WeatherQuery rejects
+    anything else with a 422 before the handler runs.
     """
-    weather_service = WeatherService()
-
+    city, lat, lon = query.city, query.lat, query.lon
     try:
         if city:
             # Get weather by city
             data = await weather_service.get_current_weather_by_city(city)
             search_type = "city"
-        elif lat is not None and lon is not None:
+        else:
             # Get weather by coordinates
             data = await weather_service.get_current_weather_by_coordinates(lat, lon)
             search_type = "coordinates"
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Either 'city' or both 'lat' and 'lon' parameters are required",
-            )
 
         # Parse response
         weather_response = parse_weather_data(data)
 
-        # Save to search history
-        history_entry = SearchHistory(
-            search_type=search_type,
-            city=city if city else weather_response.city,
-            latitude=lat if lat is not None else weather_response.latitude,
-            longitude=lon if lon is not None else weather_response.longitude,
-            response_data=json.dumps(data),
+        # Queue for the batched history writer
+        history_queue.put_nowait(
+            {
+                "search_type": search_type,
+                "city": city if city else weather_response.city,
+                "latitude": lat if lat is not None else weather_response.latitude,
+                "longitude": lon if lon is not None else weather_response.longitude,
+                "response_data": encode_response_data(data),
+                "timestamp": datetime.utcnow(),
+            }
         )
-        db.add(history_entry)
-        await db.commit()
 
-        return weather_response
+        return cacheable_json_response(request, weather_response)
 
-    except HTTPException:
-        raise
     except Exception as e:
         if "404" in str(e):
             raise HTTPException(
@@ -160,32 +192,33 @@ async def get_weather(
     description="Get weather forecast for 1-5 days",
 )
 async def get_weather_forecast(
+    request: Request,
     city: str = Query(..., description="City name"),
     days: int = Query(5, description="Number of days (1-5)", ge=1, le=5),
-    db: AsyncSession = Depends(get_db),
-) -> ForecastResponse:
+    weather_service: WeatherService = Depends(get_weather_service),
+    history_queue: asyncio.Queue[Dict[str, Any]] = Depends(get_history_queue),
+) -> Response:
     """Get weather forecast for the specified city and number of days."""
-    weather_service = WeatherService()
-
     try:
         data = await weather_service.get_weather_forecast(city, days)
 
         # Parse response
         forecast_response = parse_forecast_data(data, days)
 
-        # Save to search history
-        history_entry = SearchHistory(
-            search_type="forecast",
-            city=city,
-            latitude=forecast_response.latitude,
-            longitude=forecast_response.longitude,
-            forecast_days=days,
-            response_data=json.dumps(data),
+        # Queue for the batched history writer
+        history_queue.put_nowait(
+            {
+                "search_type": "forecast",
+                "city": city,
+                "latitude": forecast_response.latitude,
+                "longitude": forecast_response.longitude,
+                "forecast_days": days,
+                "response_data": encode_response_data(data),
+                "timestamp": datetime.utcnow(),
+            }
         )
-        db.add(history_entry)
-        await db.commit()
 
-        return forecast_response
+        return cacheable_json_response(request, forecast_response)
 
     except Exception as e:
         if "404" in str(e):
@@ -201,48 +234,91 @@ async def get_weather_forecast(
 
 @router.get(
     "/history",
-    response_model=SearchHistoryResponse,
+    responses={200: {"model": SearchHistoryResponse}},
     summary="Get search history",
     description="Retrieve all weather search history",
 )
 async def get_search_history(
     limit: int = Query(100, description="Maximum number of records", ge=1, le=1000),
-    offset: int = Query(0, description="Number of records to skip", ge=0),
+    before: Optional[datetime] = Query(
+        None, description="Only return records older than this timestamp (cursor)"
+    ),
+    before_id: Optional[int] = Query(
+        None, description="Id of the last record seen at the before timestamp"
+    ),
     db: AsyncSession = Depends(get_db),
-) -> SearchHistoryResponse:
-    """Get weather search history."""
+) -> ORJSONResponse:
+    """
+    Get weather search history.
+
+    Pages are fetched with a (timestamp, id) keyset cursor: pass the previous
+    page's next_cursor and next_cursor_id as before and before_id to get the
+    next page. The id breaks ties between rows stamped at the same instant.
+    """
     # Get total count
-    count_result = await db.execute(select(SearchHistory).limit(1))
-    total = len(count_result.all())
+    count_result = await db.execute(select(func.count()).select_from(SearchHistory))
+    total = count_result.scalar_one()
 
     # Get paginated results
-    result = await db.execute(
-        select(SearchHistory)
-        .order_by(SearchHistory.timestamp.desc())
-        .limit(limit)
-        .offset(offset)
-    )
+    query = select(SearchHistory).options(defer(SearchHistory.response_data))
+    if before is not None:
+        # Timestamps are stored as naive UTC
+        if before.tzinfo is not None:
+            before = before.astimezone(timezone.utc).replace(tzinfo=None)
+        if before_id is not None:
+            # Row-value comparison so SQLite can seek the timestamp index
+            query = query.where(
+                tuple_(SearchHistory.timestamp, SearchHistory.id)
+                < tuple_(before, before_id)
+            )
+        else:
+            query = query.where(SearchHistory.timestamp < before)
+    query = query.order_by(SearchHistory.timestamp.desc(), SearchHistory.id.desc())
+    result = await db.execute(query.limit(limit))
     history_items = result.scalars().all()
 
-    return SearchHistoryResponse(
-        total=total,
-        items=[SearchHistoryItem.model_validate(item) for item in history_items],
+    # A short page means there is nothing older left to fetch
+    last_item = history_items[-1] if len(history_items) == limit else None
+
+    # Rows come from our own table, so serialize them directly instead of
+    # going through response_model validation and jsonable_encoder
+    return ORJSONResponse(
+        {
+            "total": total,
+            "items": [
+                {
+                    "id": item.id,
+                    "search_type": item.search_type,
+                    "city": item.city,
+                    "latitude": item.latitude,
+                    "longitude": item.longitude,
+                    "forecast_days": item.forecast_days,
+                    "timestamp": item.timestamp,
+                }
+                for item in history_items
+            ],
+            "next_cursor": last_item.timestamp if last_item else None,
+            "next_cursor_id": last_item.id if last_item else None,
+        }
     )
 
 
 @router.delete(
     "/history",
-    response_model=DeleteHistoryResponse,
+    responses={200: {"model": DeleteHistoryResponse}},
     summary="Clear search history",
     description="Delete all weather search history",
 )
 async def clear_search_history(
     db: AsyncSession = Depends(get_db),
-) -> DeleteHistoryResponse:
+) -> ORJSONResponse:
     """Clear all weather search history."""
     result = await db.execute(delete(SearchHistory))
     await db.commit()
 
-    return DeleteHistoryResponse(
-        message="Search history cleared successfully", deleted_count=result.rowcount
+    return ORJSONResponse(
+        {
+            "message": "Search history cleared successfully",
+            "deleted_count": result.rowcount,
+        }
     )
@@ -2,7 +2,24 @@
 
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+class WeatherQuery(BaseModel):
+    """Schema for current weather query parameters."""
+
+    city: Optional[str] = Field(None, description="City name")
+    lat: Optional[float] = Field(None, description="Latitude", ge=-90, le=90)
+    lon: Optional[float] = Field(None, description="Longitude", ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def require_location(self) -> "WeatherQuery":
+        """Require either a city or both coordinates."""
+        if not self.city and (self.lat is None or self.lon is None):
+            raise ValueError(
+                "Either 'city' or both 'lat' and 'lon' parameters are required"
+            )
+        return self
 
 
 class WeatherResponse(BaseModel):
@@ -27,11 +44,6 @@ class WeatherResponse(BaseModel):
     weather_icon: str
     timestamp: datetime
 
-    class Config:
-        """Pydantic configuration."""
-
-        json_encoders = {datetime: lambda v: v.isoformat()}
-
 
 class ForecastItem(BaseModel):
     """Schema for a single forecast item."""
@@ -51,11 +63,6 @@ class ForecastItem(BaseModel):
     clouds: int
     pop: float  # Probability of precipitation
 
-    class Config:
-        """Pydantic configuration."""
-
-        json_encoders = {datetime: lambda v: v.isoformat()}
-
 
 class ForecastResponse(BaseModel):
     """Schema for weather forecast response."""
@@ -67,11 +74,6 @@ class ForecastResponse(BaseModel):
     days_requested: int
     forecast: List[ForecastItem]
 
-    class Config:
-        """Pydantic configuration."""
-
-        json_encoders = {datetime: lambda v: v.isoformat()}
-
 
 class SearchHistoryItem(BaseModel):
     """Schema for search history item."""
@@ -88,7 +90,6 @@ class SearchHistoryItem(BaseModel):
         """Pydantic configuration."""
 
         from_attributes = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
 
 
 class SearchHistoryResponse(BaseModel):
@@ -96,6 +97,8 @@ class SearchHistoryResponse(BaseModel):
 
     total: int
     items: List[SearchHistoryItem]
+    next_cursor: Optional[datetime] = None
+    next_cursor_id: Optional[int] = None
 
 
 class ErrorResponse(BaseModel):
@@ -106,11 +109,6 @@ class ErrorResponse(BaseModel):
     status_code: int
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        """Pydantic configuration."""
-
-        json_encoders = {datetime: lambda v: v.isoformat()}
-
 
 class DeleteHistoryResponse(BaseModel):
     """Schema for delete history response."""
@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     # OpenWeatherMap API Configuration
     openweather_api_key: str
     openweather_base_url: str = "https://api.openweathermap.org/data/2.5"
+    openweather_cache_ttl: int = 300  # Seconds to reuse an upstream response
 
     # Database Configuration
     database_url: str = "sqlite+aiosqlite:///./weather.db"
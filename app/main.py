@@ -1,17 +1,20 @@
 """Main FastAPI application module."""
 
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
+import asyncio
 import os
+import sys
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from app.config import get_settings
 from app.models import init_db
+from app.services import WeatherService, create_http_client, run_history_writer
 from app.api.endpoints import router as weather_router
 
 settings = get_settings()
@@ -23,8 +26,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Startup
     await init_db()
     print("Database initialized")
+    app.state.http_client = create_http_client()
+    app.state.weather_service = WeatherService(app.state.http_client)
+    app.state.history_queue = asyncio.Queue()
+    history_writer = asyncio.create_task(run_history_writer(app.state.history_queue))
     yield
     # Shutdown
+    history_writer.cancel()
+    with suppress(asyncio.CancelledError):
+        await history_writer
+    await app.state.http_client.aclose()
     print("Application shutting down")
 
 
@@ -40,6 +51,7 @@ app = FastAPI(
     description="A Weather API service with external API integration and search history",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -95,4 +107,8 @@ if __name__ == "__main__":
         host=settings.app_host,
         port=settings.app_port,
         reload=settings.debug,
+        # uvloop has no Windows support
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
     )
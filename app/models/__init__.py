@@ -1,6 +1,6 @@
 """Database models package."""
 
-from .database import Base, get_db, init_db
+from .database import Base, async_session, get_db, init_db
 from .search_history import SearchHistory
 
-__all__ = ["Base", "get_db", "init_db", "SearchHistory"]
+__all__ = ["Base", "async_session", "get_db", "init_db", "SearchHistory"]
@@ -1,6 +1,8 @@
 """Database configuration and session management."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Any
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.config import get_settings
@@ -10,6 +12,24 @@ settings = get_settings()
 # Create async engine
 engine = create_async_engine(settings.database_url, echo=settings.debug, future=True)
 
+
+if engine.dialect.name == "sqlite":
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+        """Tune SQLite for concurrent reads alongside the history writer."""
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers run while a commit is in progress
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+
+# Workers racing create_all retry this many times before giving up
+INIT_DB_ATTEMPTS = 3
+
 # Create async session factory
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
@@ -27,6 +47,18 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """Initialize database tables."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """
+    Initialize database tables.
+
+    Every uvicorn worker runs this at startup, so two workers can both find a
+    table missing and race to create it. The loser retries, and create_all
+    then skips whatever the winner already made.
+    """
+    for attempt in range(INIT_DB_ATTEMPTS):
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            return
+        except OperationalError as e:
+            if "already exists" not in str(e) or attempt == INIT_DB_ATTEMPTS - 1:
+                raise
@@ -1,7 +1,7 @@
 """Search history model."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, LargeBinary
 from .database import Base
 
 
@@ -18,8 +18,10 @@ class SearchHistory(Base):
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
     forecast_days = Column(Integer, nullable=True)
-    response_data = Column(Text, nullable=False)  # JSON string of the response
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    response_data = Column(
+        LargeBinary, nullable=False
+    )  # zstd-compressed msgpack of the response
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
     def __repr__(self) -> str:
         """String representation of SearchHistory."""
@@ -1,5 +1,20 @@
 """Services package."""
 
-from .weather_service import WeatherService
+from .openweather_schemas import OWMRawWeather, OWMRawForecast
+from .history_writer import (
+    encode_response_data,
+    get_history_queue,
+    run_history_writer,
+)
+from .weather_service import WeatherService, create_http_client, get_weather_service
 
-__all__ = ["WeatherService"]
+__all__ = [
+    "WeatherService",
+    "OWMRawWeather",
+    "OWMRawForecast",
+    "create_http_client",
+    "get_weather_service",
+    "encode_response_data",
+    "get_history_queue",
+    "run_history_writer",
+]
@@ -0,0 +1,67 @@
+"""Background writer that batches search history inserts."""
+
+from typing import Dict, Any, List
+import asyncio
+import logging
+import msgspec
+import zstandard
+from fastapi import Request
+from app.models import async_session, SearchHistory
+
+logger = logging.getLogger(__name__)
+
+# Most entries written in a single transaction
+HISTORY_BATCH_SIZE = 100
+
+_compressor = zstandard.ZstdCompressor(level=3)
+
+
+def encode_response_data(data: msgspec.Struct) -> bytes:
+    """Pack a decoded upstream payload for the response_data column."""
+    return _compressor.compress(msgspec.msgpack.encode(data))
+
+
+def get_history_queue(request: Request) -> asyncio.Queue[Dict[str, Any]]:
+    """Dependency to get the search history queue created at startup."""
+    return request.app.state.history_queue
+
+
+async def _insert_history(batch: List[Dict[str, Any]]) -> None:
+    """
+    Insert a batch of search history entries in a single transaction.
+
+    A failed batch is logged and dropped, so its entries are lost.
+    """
+    try:
+        async with async_session() as session:
+            session.add_all([SearchHistory(**entry) for entry in batch])
+            await session.commit()
+    except Exception:
+        logger.exception("Failed to save %d search history entries", len(batch))
+
+
+async def run_history_writer(queue: asyncio.Queue[Dict[str, Any]]) -> None:
+    """
+    Drain queued search history entries and insert them in batches.
+
+    Each entry is written as soon as the writer is free, together with
+    whatever else queued up meanwhile, so batches only grow under load.
+    Runs until cancelled, then flushes whatever is still queued.
+
+    Args:
+        queue: Queue of SearchHistory column values pushed by the endpoints
+    """
+    batch: List[Dict[str, Any]] = []
+    try:
+        while True:
+            batch.append(await queue.get())
+            while len(batch) < HISTORY_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            await _insert_history(batch)
+            batch = []
+    except asyncio.CancelledError:
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            await _insert_history(batch)
+        raise
@@ -0,0 +1,94 @@
+"""Typed structs mirroring the OpenWeatherMap response payloads."""
+
+from typing import Optional, List
+import msgspec
+
+
+class OWMCoord(msgspec.Struct):
+    """Geographic coordinates of a location."""
+
+    lat: float
+    lon: float
+
+
+class OWMMain(msgspec.Struct):
+    """Temperature, pressure and humidity readings."""
+
+    temp: float
+    feels_like: float
+    temp_min: float
+    temp_max: float
+    pressure: int
+    humidity: int
+
+
+class OWMWeather(msgspec.Struct):
+    """Weather condition summary."""
+
+    main: str
+    description: str
+    icon: str
+
+
+class OWMWind(msgspec.Struct):
+    """Wind readings."""
+
+    speed: float
+    deg: int
+
+
+class OWMClouds(msgspec.Struct):
+    """Cloudiness readings."""
+
+    all: int
+
+
+class OWMSys(msgspec.Struct):
+    """System data attached to current weather."""
+
+    country: Optional[str] = None
+
+
+class OWMRawWeather(msgspec.Struct):
+    """Payload returned by the /weather endpoint."""
+
+    coord: OWMCoord
+    main: OWMMain
+    weather: List[OWMWeather]
+    wind: OWMWind
+    clouds: OWMClouds
+    dt: int
+    name: Optional[str] = None
+    visibility: Optional[int] = None
+    sys: OWMSys = msgspec.field(default_factory=OWMSys)
+
+
+class OWMForecastItem(msgspec.Struct):
+    """A single 3-hour interval in a forecast payload."""
+
+    dt: int
+    main: OWMMain
+    weather: List[OWMWeather]
+    wind: OWMWind
+    clouds: OWMClouds
+    pop: float = 0  # Probability of precipitation
+
+
+class OWMCity(msgspec.Struct):
+    """City the forecast was produced for."""
+
+    name: str
+    country: str
+    coord: OWMCoord
+
+
+class OWMRawForecast(msgspec.Struct):
+    """Payload returned by the /forecast endpoint."""
+
+    list: List[OWMForecastItem]
+    city: OWMCity
+
+
+# Decoders are built once; strict=False keeps pydantic-style lax number coercion
+weather_decoder = msgspec.json.Decoder(OWMRawWeather, strict=False)
+forecast_decoder = msgspec.json.Decoder(OWMRawForecast, strict=False)
@@ -1,20 +1,91 @@
 """Weather service for OpenWeatherMap API integration."""
 
 from typing import Dict, Any
+import asyncio
 import httpx
+import msgspec
+from cachetools import TTLCache
+from fastapi import Request
 from app.config import get_settings
+from .openweather_schemas import (
+    OWMRawWeather,
+    OWMRawForecast,
+    weather_decoder,
+    forecast_decoder,
+)
+
+settings = get_settings()
+
+# Query params sent with every request
+_BASE_PARAMS = {"appid": settings.openweather_api_key, "units": "metric"}
+
+# Upstream responses keyed by (endpoint, sorted query params)
+_response_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.openweather_cache_ttl)
+_response_cache_lock = asyncio.Lock()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the shared HTTP client used for OpenWeatherMap requests."""
+    return httpx.AsyncClient(
+        base_url=settings.openweather_base_url,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+def get_weather_service(request: Request) -> "WeatherService":
+    """Dependency to get the shared weather service created at startup."""
+    return request.app.state.weather_service
 
 
 class WeatherService:
     """Service for fetching weather data from OpenWeatherMap API."""
 
-    def __init__(self) -> None:
-        """Initialize weather service with configuration."""
-        self.settings = get_settings()
-        self.base_url = self.settings.openweather_base_url
-        self.api_key = self.settings.openweather_api_key
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        """
+        Initialize weather service.
+
+        Args:
+            client: Shared HTTP client whose base URL points at OpenWeatherMap
+        """
+        self.client = client
 
-    async def get_current_weather_by_city(self, city: str) -> Dict[str, Any]:
+    async def _get(
+        self, endpoint: str, params: Dict[str, Any], decoder: msgspec.json.Decoder
+    ) -> Any:
+        """
+        Fetch an OpenWeatherMap endpoint, reusing recent responses.
+
+        Args:
+            endpoint: Path relative to the OpenWeatherMap base URL
+            params: Query parameters identifying the lookup
+            decoder: Decoder for the endpoint's payload struct
+
+        Returns:
+            Decoded response struct
+
+        Raises:
+            httpx.HTTPStatusError: If API request fails
+            msgspec.ValidationError: If the payload doesn't match the struct
+        """
+        key = (endpoint, tuple(sorted(params.items())))
+        async with _response_cache_lock:
+            cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = await self.client.get(
+            endpoint,
+            params={**params, **_BASE_PARAMS},
+        )
+        response.raise_for_status()
+        data = decoder.decode(response.content)
+
+        async with _response_cache_lock:
+            _response_cache[key] = data
+        return data
+
+    async def get_current_weather_by_city(self, city: str) -> OWMRawWeather:
         """
         Get current weather data by city name.
 
@@ -22,22 +93,16 @@ class WeatherService:
             city: Name of the city
 
         Returns:
-            Weather data dictionary
+            Current weather payload
 
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/weather",
-                params={"q": city, "appid": self.api_key, "units": "metric"},
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get("/weather", {"q": city}, weather_decoder)
 
     async def get_current_weather_by_coordinates(
         self, latitude: float, longitude: float
-    ) -> Dict[str, Any]:
+    ) -> OWMRawWeather:
         """
         Get current weather data by coordinates.
 
@@ -46,25 +111,16 @@ class WeatherService:
             longitude: Longitude coordinate
 
         Returns:
-            Weather data dictionary
+            Current weather payload
 
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/weather",
-                params={
-                    "lat": latitude,
-                    "lon": longitude,
-                    "appid": self.api_key,
-                    "units": "metric",
-                },
-            )
-            response.raise_for_status()
-            return response.json()
-
-    async def get_weather_forecast(self, city: str, days: int = 5) -> Dict[str, Any]:
+        return await self._get(
+            "/weather", {"lat": latitude, "lon": longitude}, weather_decoder
+        )
+
+    async def get_weather_forecast(self, city: str, days: int = 5) -> OWMRawForecast:
         """
         Get weather forecast for specified days.
 
@@ -73,22 +129,18 @@ class WeatherService:
             days: Number of days for forecast (1-5)
 
         Returns:
-            Weather forecast data dictionary
+            Weather forecast payload
 
         Raises:
             httpx.HTTPStatusError: If API request fails
         """
         # OpenWeatherMap free tier provides 5-day forecast with 3-hour intervals
         # We'll use the forecast endpoint and limit the results based on days
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/forecast",
-                params={
-                    "q": city,
-                    "appid": self.api_key,
-                    "units": "metric",
-                    "cnt": days * 8,  # 8 intervals per day (3-hour intervals)
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        return await self._get(
+            "/forecast",
+            {
+                "q": city,
+                "cnt": days * 8,  # 8 intervals per day (3-hour intervals)
+            },
+            forecast_decoder,
+        )